@@ -0,0 +1,28 @@
+"""
+Shared pytest fixtures
+"""
+
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture(autouse=True, scope='session')
+def fast_sqlite():
+    """
+    Open every SQLite connection in WAL mode with synchronous=NORMAL
+
+    Test databases are throwaway, so commits don't need to be synced to
+    disk; the event logger and classifier open a connection per call.
+    """
+    connect = sqlite3.connect
+
+    def fast_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    sqlite3.connect = fast_connect
+    yield
+    sqlite3.connect = connect
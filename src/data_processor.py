@@ -3,12 +3,17 @@ Data Processor
 Processes thermal frames and calculates ROI statistics
 """
 
+import bisect
 import logging
 import numpy as np
 from datetime import datetime
 from typing import Dict, List, Any
 
 
+# Alert levels in increasing severity
+_ALERT_LEVELS = ('normal', 'warning', 'critical', 'emergency')
+
+
 class DataProcessor:
     """Process thermal data and calculate statistics"""
     
@@ -26,6 +31,20 @@ class DataProcessor:
         
         self.logger.info(f"Initialized with {len(self.rois)} ROIs, transformer detection: {self.detection_enabled}")
     
+    @property
+    def rois(self) -> List[Dict]:
+        """ROI configurations"""
+        return self._rois
+    
+    @rois.setter
+    def rois(self, rois: List[Dict]):
+        """Replace the ROIs and precompute each one's alert level bounds"""
+        self._rois = rois or []
+        self._roi_entries = [
+            (roi_config, self._build_threshold_bounds(roi_config.get('thresholds') or {}))
+            for roi_config in self._rois
+        ]
+    
     def process(self, thermal_frame: np.ndarray) -> Dict[str, Any]:
         """
         Process thermal frame and calculate all statistics
@@ -50,11 +69,11 @@ class DataProcessor:
         roi_temps = []
         roi_weights = []
         
-        for roi_config in self.rois:
+        for roi_config, threshold_bounds in self._roi_entries:
             if not roi_config.get('enabled', True):
                 continue
             
-            roi_data = self._process_roi(thermal_frame, roi_config)
+            roi_data = self._process_roi(thermal_frame, roi_config, threshold_bounds)
             result['regions'].append(roi_data)
             
             # Collect for composite calculation
@@ -95,7 +114,8 @@ class DataProcessor:
             return bool(obj)
         return obj
     
-    def _process_roi(self, frame: np.ndarray, roi_config: Dict) -> Dict[str, Any]:
+    def _process_roi(self, frame: np.ndarray, roi_config: Dict,
+                     threshold_bounds: tuple = None) -> Dict[str, Any]:
         """Process a single region of interest"""
         name = roi_config['name']
         coords = roi_config['coordinates']
@@ -124,8 +144,9 @@ class DataProcessor:
         }
         
         # Check thresholds
-        thresholds = roi_config.get('thresholds', {})
-        stats['alert_level'] = self._check_thresholds(stats['max_temp'], thresholds)
+        if threshold_bounds is None:
+            threshold_bounds = self._build_threshold_bounds(roi_config.get('thresholds') or {})
+        stats['alert_level'] = self._alert_level(stats['max_temp'], threshold_bounds)
         
         return stats
     
@@ -152,15 +173,22 @@ class DataProcessor:
         if not temps:
             return None
         
+        t = np.asarray(temps, dtype=np.float64)
         if method == 'weighted_average':
-            return float(np.average(temps, weights=weights))
+            # Dot product instead of np.average, whose argument checks cost
+            # more than the arithmetic for a handful of ROIs
+            w = np.asarray(weights, dtype=np.float64)
+            total = w.sum()
+            if total == 0:
+                raise ZeroDivisionError("Weights sum to zero, can't be normalized")
+            return float(t @ w / total)
         elif method == 'max':
-            return float(np.max(temps))
+            return float(t.max())
         elif method == 'average':
-            return float(np.mean(temps))
+            return float(t.mean())
         else:
             self.logger.warning(f"Unknown composite method: {method}, using average")
-            return float(np.mean(temps))
+            return float(t.mean())
     
     def _apply_emissivity(self, data: np.ndarray, emissivity: float) -> np.ndarray:
         """Apply emissivity correction using Stefan-Boltzmann"""
@@ -351,11 +379,30 @@ class DataProcessor:
         if not thresholds:
             return 'normal'
         
-        if temperature >= thresholds.get('emergency', float('inf')):
-            return 'emergency'
-        elif temperature >= thresholds.get('critical', float('inf')):
-            return 'critical'
-        elif temperature >= thresholds.get('warning', float('inf')):
-            return 'warning'
-        else:
-            return 'normal'
\ No newline at end of file
+        return self._alert_level(temperature, self._build_threshold_bounds(thresholds))
+    
+    @staticmethod
+    def _alert_level(temperature: float, threshold_bounds: tuple) -> str:
+        """Alert level for a temperature, given _build_threshold_bounds output"""
+        # NaN compares false against every threshold
+        if temperature != temperature:
+            return 'normal'
+        return _ALERT_LEVELS[bisect.bisect_right(threshold_bounds, temperature)]
+    
+    @staticmethod
+    def _build_threshold_bounds(thresholds: Dict) -> tuple:
+        """
+        Lower bound of each alert level above 'normal', in level order
+        
+        A level applies when the temperature reaches its own threshold or
+        any higher level's, so each bound is the minimum of the thresholds
+        from that level up. The bounds are then non-decreasing even if the
+        configured thresholds are not, and bisecting them gives the highest
+        level reached.
+        """
+        bounds = []
+        lowest = float('inf')
+        for level in reversed(_ALERT_LEVELS[1:]):
+            lowest = min(lowest, thresholds.get(level, float('inf')))
+            bounds.append(lowest)
+        return tuple(reversed(bounds))
\ No newline at end of file
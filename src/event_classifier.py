@@ -320,13 +320,13 @@ class EventClassifier:
         if not contours:
             return "unknown", 0.0, 0.0
 
-        # Calculate total motion area
-        total_area = sum(cv2.contourArea(c) for c in contours)
+        # One contourArea call per contour, shared by the total and the
+        # largest area
+        areas = [cv2.contourArea(c) for c in contours]
+        total_area = sum(areas)
         area_percentage = total_area / self.frame_area
 
-        # Find largest contour
-        largest_contour = max(contours, key=cv2.contourArea)
-        largest_area = cv2.contourArea(largest_contour)
+        largest_area = max(areas)
         largest_percentage = largest_area / self.frame_area
 
         # Classify based on size with updated thresholds
@@ -133,6 +133,54 @@ class EventLogger:
             self.logger.error(f"Failed to log event: {e}")
             return -1
 
+    def bulk_log_events(self, events: List[Dict[str, Any]]) -> int:
+        """
+        Insert several camera events in one transaction
+
+        One executemany and a single commit, instead of a connection and a
+        commit (with its journal sync) per event as with log_event.
+
+        Args:
+            events: Dicts with the log_event arguments (event_type and
+                confidence required, the rest optional)
+
+        Returns:
+            Number of events inserted, or -1 on error
+        """
+        try:
+            now = datetime.now()
+            rows = [
+                (
+                    (event.get('timestamp') or now).isoformat(),
+                    event['event_type'],
+                    event['confidence'],
+                    event.get('image_path'),
+                    event.get('duration_seconds'),
+                    event.get('notes')
+                )
+                for event in events
+            ]
+
+            conn = sqlite3.connect(self.db_path)
+            try:
+                with conn:
+                    conn.executemany("""
+                        INSERT INTO camera_events (
+                            timestamp, event_type, confidence,
+                            image_path, duration_seconds, notes
+                        ) VALUES (?, ?, ?, ?, ?, ?)
+                    """, rows)
+            finally:
+                conn.close()
+
+            self.logger.info(f"Events logged: {len(rows)}")
+
+            return len(rows)
+
+        except Exception as e:
+            self.logger.error(f"Failed to log events: {e}")
+            return -1
+
     def get_events_by_type(
         self,
         event_type: str,
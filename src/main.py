@@ -100,7 +100,8 @@ class TransformerMonitor:
         self.thermal_camera = ThermalCapture(
             i2c_addr=self.config.get('thermal_camera.i2c_address', 0x33),
             i2c_bus=self.config.get('thermal_camera.i2c_bus', 1),
-            refresh_rate=self.config.get('thermal_camera.refresh_rate', 8)
+            refresh_rate=self.config.get('thermal_camera.refresh_rate', 8),
+            hotspot_history_path=self.config.get('thermal_camera.hotspot_history_path')
         )
         
         # Initialize data processor
@@ -450,22 +451,30 @@ class TransformerMonitor:
                     'timestamp': processed_data.get('timestamp')
                 }
                 
-                success = self.thermal_image_gen.generate_and_save(
+                def on_saved(success, filepath=filepath, metadata=metadata,
+                             is_priority=is_priority):
+                    if success:
+                        # Queue for FTP upload
+                        self.media_uploader.queue_thermal_image(
+                            filepath,
+                            metadata,
+                            priority=is_priority
+                        )
+                    else:
+                        self.logger.error(f"Failed to save thermal image: {filepath}")
+                
+                # Encoding and writing happen on the generator's writer thread
+                self.thermal_image_gen.generate_and_save_async(
                     thermal_frame,
                     filepath,
                     rois=rois,
                     hotspots=hotspots,
-                    metadata=metadata
+                    metadata=metadata,
+                    on_done=on_saved
                 )
-                
-                if success:
-                    # Queue for FTP upload
-                    self.media_uploader.queue_thermal_image(
-                        filepath,
-                        metadata,
-                        priority=is_priority
-                    )
-                    self.last_thermal_image_time = current_time
+                # Mark the interval as served once the job is queued, so the
+                # next capture doesn't queue a duplicate before it finishes
+                self.last_thermal_image_time = current_time
                     
             except Exception as e:
                 self.logger.error(f"Failed to generate/upload thermal image: {e}")
@@ -575,6 +584,10 @@ class TransformerMonitor:
         if self.temp_data_collector:
             self.temp_data_collector.force_flush()
         
+        # Finish pending thermal image writes before the uploader stops
+        if self.thermal_image_gen:
+            self.thermal_image_gen.close()
+        
         # Stop media uploader
         if self.media_uploader:
             self.media_uploader.stop()
@@ -0,0 +1,286 @@
+"""
+Thermal Processing Kernels
+Numba-compiled kernels for the per-frame thermal processing pipeline
+
+The MLX90640 frame is only 24x32, so the NumPy/OpenCV pipeline in
+ThermalCapture spends most of its time in call dispatch and temporary
+allocations rather than arithmetic. These kernels fuse the pipeline
+stages into explicit loops compiled to native code.
+
+Numba is optional. When it is not installed NUMBA_AVAILABLE is False and
+ThermalCapture keeps using its NumPy/OpenCV implementation.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback no-op decorator when numba is not installed"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def _median3x3(frame, y, x):
+    """Median of the 3x3 neighborhood of (y, x), replicating edge pixels"""
+    rows, cols = frame.shape
+    window = np.empty(9, dtype=np.float32)
+    n = 0
+    for dy in range(-1, 2):
+        yy = min(max(y + dy, 0), rows - 1)
+        for dx in range(-1, 2):
+            xx = min(max(x + dx, 0), cols - 1)
+            # Insertion sort as we go; the window is only 9 values
+            v = frame[yy, xx]
+            i = n
+            while i > 0 and window[i - 1] > v:
+                window[i] = window[i - 1]
+                i -= 1
+            window[i] = v
+            n += 1
+    return window[4]
+
+
+@njit(cache=True)
+def _good_neighbor_mean(frame, mask, y, x):
+    """Mean of the unmasked 8-neighbors of (y, x), or the pixel if none"""
+    rows, cols = frame.shape
+    acc = 0.0
+    n = 0
+    for yy in range(max(y - 1, 0), min(y + 2, rows)):
+        for xx in range(max(x - 1, 0), min(x + 2, cols)):
+            if (yy != y or xx != x) and not mask[yy, xx]:
+                acc += frame[yy, xx]
+                n += 1
+    if n == 0:
+        return frame[y, x]
+    return acc / n
+
+
+@njit(cache=True)
+def _reflect101(i, n):
+    """Index into [0, n) with OpenCV's BORDER_REFLECT_101 rule"""
+    if i < 0:
+        return -i
+    if i >= n:
+        return 2 * n - i - 2
+    return i
+
+
+@njit(cache=True, fastmath=True)
+def process_frame_fused(frame, ring, slot_weights, use_temporal, prev_frame,
+                        motion_threshold, gauss_k, compensation, detect,
+                        scratch, outlier_mask, out):
+    """
+    Bad pixel correction, temporal filter, Gaussian denoise and ambient
+    compensation in two passes over the frame (three when the temporal
+    filter is applied)
+
+    Args:
+        frame: Validated raw frame (float32, 24x32)
+        ring: Temporal ring buffer (N, 24, 32)
+        slot_weights: Per-slot temporal weights (N,), zero for unused slots
+        use_temporal: Replace the frame with the temporal average, unless
+            the scene changed
+        prev_frame: Previous bad-pixel-corrected frame (24x32 float32),
+            overwritten with this frame's
+        motion_threshold: Skip the temporal average if any corrected pixel
+            differs from prev_frame by more than this
+        gauss_k: 1-D Gaussian kernel (3,)
+        compensation: Ambient offset subtracted from every pixel
+        detect: Detect outliers per frame (5 std from the median) and
+            replace them with their 3x3 median; otherwise outlier_mask is a
+            calibrated bad-pixel mask and those pixels get the mean of
+            their good neighbors
+        scratch: Work buffer (24x32 float32)
+        outlier_mask: Bad pixel mask (uint8); written when detect is set
+        out: Output frame (24x32 float32)
+
+    Returns:
+        Number of outlier pixels detected, or masked when not detecting
+    """
+    rows, cols = frame.shape
+    center = 0.0
+    limit = 0.0
+    if detect:
+        center = np.median(frame)
+        limit = 5.0 * np.std(frame)
+    outliers = 0
+
+    # Pass 1: bad pixel detection/correction, tracking the largest change
+    # from the previous corrected frame (same domain, before denoising and
+    # ambient compensation)
+    max_delta = 0.0
+    for y in range(rows):
+        for x in range(cols):
+            v = frame[y, x]
+            if detect:
+                is_outlier = abs(v - center) > limit
+                outlier_mask[y, x] = is_outlier
+            else:
+                is_outlier = outlier_mask[y, x] != 0
+            if is_outlier:
+                outliers += 1
+                if detect:
+                    v = _median3x3(frame, y, x)
+                else:
+                    v = _good_neighbor_mean(frame, outlier_mask, y, x)
+            scratch[y, x] = v
+            if use_temporal:
+                max_delta = max(max_delta, abs(v - prev_frame[y, x]))
+            prev_frame[y, x] = v
+
+    # Pass 1b: temporal average, skipped when the scene changed
+    if use_temporal and max_delta <= motion_threshold:
+        for y in range(rows):
+            for x in range(cols):
+                acc = 0.0
+                for k in range(ring.shape[0]):
+                    acc += slot_weights[k] * ring[k, y, x]
+                scratch[y, x] = acc
+
+    # Pass 2: separable 3x3 Gaussian (unrolled) and ambient compensation
+    for y in range(rows):
+        y0 = _reflect101(y - 1, rows)
+        y2 = _reflect101(y + 1, rows)
+        for x in range(cols):
+            x0 = _reflect101(x - 1, cols)
+            x2 = _reflect101(x + 1, cols)
+            top = gauss_k[0] * scratch[y0, x0] + gauss_k[1] * scratch[y0, x] + gauss_k[2] * scratch[y0, x2]
+            mid = gauss_k[0] * scratch[y, x0] + gauss_k[1] * scratch[y, x] + gauss_k[2] * scratch[y, x2]
+            bot = gauss_k[0] * scratch[y2, x0] + gauss_k[1] * scratch[y2, x] + gauss_k[2] * scratch[y2, x2]
+            out[y, x] = gauss_k[0] * top + gauss_k[1] * mid + gauss_k[2] * bot - compensation
+
+    return outliers
+
+
+@njit(cache=True)
+def _find_root(parent, i):
+    """Union-find root with path halving"""
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+@njit(cache=True)
+def label_hotspots(frame, threshold):
+    """
+    8-connected labeling of pixels above threshold with per-blob stats
+
+    Single raster scan with union-find over pixel indices. Each blob's root
+    is its first pixel in raster order, so blobs are numbered the same way
+    as cv2.connectedComponents.
+
+    Args:
+        frame: Thermal frame (2-D)
+        threshold: Pixels strictly above this are hot
+
+    Returns:
+        (count, area, temp_sum, temp_max, x_sum, y_sum) with the per-blob
+        arrays indexed 0..count-1
+    """
+    rows, cols = frame.shape
+    n = rows * cols
+    parent = np.empty(n, dtype=np.int32)
+    hot = np.zeros(n, dtype=np.bool_)
+
+    for y in range(rows):
+        for x in range(cols):
+            if not frame[y, x] > threshold:
+                continue
+            i = y * cols + x
+            hot[i] = True
+            parent[i] = i
+            # Already-visited neighbors: W, NW, N, NE
+            for dy, dx in ((0, -1), (-1, -1), (-1, 0), (-1, 1)):
+                yy = y + dy
+                xx = x + dx
+                if yy < 0 or xx < 0 or xx >= cols:
+                    continue
+                j = yy * cols + xx
+                if hot[j]:
+                    ri = _find_root(parent, i)
+                    rj = _find_root(parent, j)
+                    if ri < rj:
+                        parent[rj] = ri
+                    elif rj < ri:
+                        parent[ri] = rj
+
+    label = np.empty(n, dtype=np.int32)
+    area = np.zeros(n, dtype=np.int64)
+    temp_sum = np.zeros(n, dtype=np.float64)
+    temp_max = np.full(n, -np.inf)
+    x_sum = np.zeros(n, dtype=np.float64)
+    y_sum = np.zeros(n, dtype=np.float64)
+    count = 0
+
+    for i in range(n):
+        if not hot[i]:
+            continue
+        r = _find_root(parent, i)
+        if r == i:
+            label[i] = count
+            count += 1
+        else:
+            label[i] = label[r]
+        k = label[i]
+        t = frame[i // cols, i % cols]
+        area[k] += 1
+        temp_sum[k] += t
+        if t > temp_max[k]:
+            temp_max[k] = t
+        x_sum[k] += i % cols
+        y_sum[k] += i // cols
+
+    return (count, area[:count], temp_sum[:count], temp_max[:count],
+            x_sum[:count], y_sum[:count])
+
+
+@njit(cache=True)
+def frame_in_range(frame, low, high):
+    """
+    True if every pixel is finite and within [low, high]
+
+    Single scan that stops at the first bad pixel; NaN fails both
+    comparisons and +/-inf falls outside any finite range.
+    """
+    for v in frame.ravel():
+        if not (low <= v <= high):
+            return False
+    return True
+
+
+@njit(cache=True, fastmath=True)
+def sobel_xy(frame, grad_x, grad_y):
+    """
+    Both 3x3 Sobel derivatives in one stencil pass
+
+    Borders follow OpenCV's BORDER_REFLECT_101 like cv2.Sobel. Magnitude
+    and direction are left to cv2.cartToPolar, whose SIMD atan2 is several
+    times faster than a scalar per-pixel arctan2 here.
+
+    Args:
+        frame: Input frame (2-D)
+        grad_x: Output d/dx (float32, frame shape)
+        grad_y: Output d/dy (float32, frame shape)
+    """
+    rows, cols = frame.shape
+    for y in range(rows):
+        y0 = _reflect101(y - 1, rows)
+        y2 = _reflect101(y + 1, rows)
+        for x in range(cols):
+            x0 = _reflect101(x - 1, cols)
+            x2 = _reflect101(x + 1, cols)
+            grad_x[y, x] = ((frame[y0, x2] - frame[y0, x0])
+                            + 2 * (frame[y, x2] - frame[y, x0])
+                            + (frame[y2, x2] - frame[y2, x0]))
+            grad_y[y, x] = ((frame[y2, x0] - frame[y0, x0])
+                            + 2 * (frame[y2, x] - frame[y0, x])
+                            + (frame[y2, x2] - frame[y0, x2]))
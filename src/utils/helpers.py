@@ -3,46 +3,93 @@ Helper utilities
 """
 
 import os
+import atexit
+import functools
 import shutil
 import platform
-import psutil
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
 from typing import Dict
 
+try:
+    from smbus2 import SMBus
+    SMBUS_AVAILABLE = True
+except ImportError:
+    SMBUS_AVAILABLE = False
+
+# Open I2C bus handles, reused across probes
+_I2C_BUSES = {}
+_I2C_LOCK = threading.Lock()
+
+# CPU temperature sysfs file, opened once and re-read with pread;
+# False once it is known to be missing
+_CPU_TEMP_PATH = '/sys/class/thermal/thermal_zone0/temp'
+_TEMP_FD = None
+_TEMP_LOCK = threading.Lock()
+
+
+# Directories already created by ensure_directory in this process
+_ENSURED = set()
+_ENSURED_LOCK = threading.Lock()
+
 
 def ensure_directory(path: str) -> Path:
     """
     Ensure directory exists, create if it doesn't
     
+    Paths already ensured by this process skip the mkdir syscalls; a
+    directory deleted afterwards surfaces as an error on the next write.
+    
     Args:
         path: Directory path
         
     Returns:
         Path object
     """
-    p = Path(path)
-    p.mkdir(parents=True, exist_ok=True)
-    return p
+    p_str = os.fspath(path)
+    if p_str not in _ENSURED:
+        Path(p_str).mkdir(parents=True, exist_ok=True)
+        with _ENSURED_LOCK:
+            _ENSURED.add(p_str)
+    return Path(p_str)
+
+
+_BYTES_PER_GB = 1.0 / (1024**3)
 
+# Recent disk usage per mount point: path -> (monotonic time, stats)
+_DISK_CACHE = {}
 
-def get_disk_usage(path: str = '/') -> Dict:
+
+def get_disk_usage(path: str = '/', max_age: float = 5.0) -> Dict:
     """
     Get disk usage statistics
     
+    Disk usage moves slowly, so results are reused for max_age seconds
+    per path instead of calling statvfs on every monitoring tick.
+    
     Args:
         path: Mount point to check
+        max_age: Seconds a cached result stays valid (0 to always refresh)
         
     Returns:
         Dictionary with total, used, free, percent
     """
+    now = time.monotonic()
+    hit = _DISK_CACHE.get(path)
+    if hit is not None and now - hit[0] < max_age:
+        return dict(hit[1])
+    
     usage = shutil.disk_usage(path)
-    return {
-        'total_gb': usage.total / (1024**3),
-        'used_gb': usage.used / (1024**3),
-        'free_gb': usage.free / (1024**3),
+    result = {
+        'total_gb': usage.total * _BYTES_PER_GB,
+        'used_gb': usage.used * _BYTES_PER_GB,
+        'free_gb': usage.free * _BYTES_PER_GB,
         'percent': (usage.used / usage.total) * 100
     }
+    _DISK_CACHE[path] = (now, result)
+    return dict(result)
 
 
 def get_system_info() -> Dict:
@@ -52,17 +99,37 @@ def get_system_info() -> Dict:
     Returns:
         Dictionary with system stats
     """
+    return dict(_static_system_info())
+
+
+@functools.lru_cache(maxsize=1)
+def _static_system_info() -> Dict:
+    """System info that cannot change while the process runs, queried once"""
+    try:
+        # Same sources psutil parses (MemTotal, /proc/stat btime), read
+        # directly: one sysconf pair and the btime line
+        memory_total = os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+        with open('/proc/stat', 'rb') as f:
+            boot_time = next(int(line.split()[1]) for line in f if line.startswith(b'btime'))
+    except (OSError, ValueError, StopIteration):
+        import psutil  # Non-Linux development hosts
+        memory_total = psutil.virtual_memory().total
+        boot_time = psutil.boot_time()
+    
     return {
         'platform': platform.system(),
         'platform_release': platform.release(),
         'architecture': platform.machine(),
         'hostname': platform.node(),
-        'cpu_count': psutil.cpu_count(),
-        'memory_total_gb': psutil.virtual_memory().total / (1024**3),
-        'boot_time': datetime.fromtimestamp(psutil.boot_time()).isoformat()
+        'cpu_count': os.cpu_count(),
+        'memory_total_gb': memory_total / (1024**3),
+        'boot_time': datetime.fromtimestamp(boot_time).isoformat()
     }
 
 
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+
 def format_bytes(bytes_value: int) -> str:
     """
     Format bytes to human-readable string
@@ -73,31 +140,64 @@ def format_bytes(bytes_value: int) -> str:
     Returns:
         Formatted string (e.g., "1.5 GB")
     """
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+    if isinstance(bytes_value, int) and bytes_value > 0:
+        # Unit index straight from the bit length: each unit is 10 bits
+        idx = min((bytes_value.bit_length() - 1) // 10, 5)
+        return f"{bytes_value / (1 << (10 * idx)):.2f} {_BYTE_UNITS[idx]}"
+    
+    for unit in _BYTE_UNITS[:-1]:
         if bytes_value < 1024.0:
             return f"{bytes_value:.2f} {unit}"
         bytes_value /= 1024.0
     return f"{bytes_value:.2f} PB"
 
 
+_DATETIME_FORMATS = (
+    '%Y-%m-%dT%H:%M:%S.%fZ',
+    '%Y-%m-%dT%H:%M:%SZ',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y%m%d_%H%M%S'
+)
+
+# Digit-masked shapes of the _DATETIME_FORMATS strings the fast paths
+# handle; anything else (other ISO variants included) goes to strptime
+_DIGIT_MASK = str.maketrans('0123456789', 'dddddddddd')
+_ISO_SHAPES = frozenset(
+    ['dddd-dd-dd dd:dd:dd', 'dddd-dd-ddTdd:dd:ddZ'] +
+    ['dddd-dd-ddTdd:dd:dd.' + 'd' * n + 'Z' for n in range(1, 7)]
+)
+_COMPACT_SHAPE = 'dddddddd_dddddd'
+
+
 def parse_datetime(dt_string: str) -> datetime:
     """
     Parse datetime string with multiple format support
     
+    Strings shaped exactly like the ISO formats in _DATETIME_FORMATS go
+    through the C fromisoformat parser and the compact YYYYmmdd_HHMMSS form
+    is sliced directly; everything else goes to strptime, so the accepted
+    inputs and the naive results are the same as with strptime alone.
+    
     Args:
         dt_string: Datetime string
         
     Returns:
         datetime object
     """
-    formats = [
-        '%Y-%m-%dT%H:%M:%S.%fZ',
-        '%Y-%m-%dT%H:%M:%SZ',
-        '%Y-%m-%d %H:%M:%S',
-        '%Y%m%d_%H%M%S'
-    ]
-    
-    for fmt in formats:
+    shape = dt_string.translate(_DIGIT_MASK)
+    if shape in _ISO_SHAPES:
+        try:
+            return datetime.fromisoformat(dt_string[:-1] if dt_string.endswith('Z') else dt_string)
+        except ValueError:
+            pass
+    elif shape == _COMPACT_SHAPE:
+        try:
+            return datetime(int(dt_string[0:4]), int(dt_string[4:6]), int(dt_string[6:8]),
+                            int(dt_string[9:11]), int(dt_string[11:13]), int(dt_string[13:15]))
+        except ValueError:
+            pass
+    
+    for fmt in _DATETIME_FORMATS:
         try:
             return datetime.strptime(dt_string, fmt)
         except ValueError:
@@ -113,11 +213,21 @@ def get_cpu_temperature() -> float:
     Returns:
         Temperature in Celsius, or None if unavailable
     """
+    global _TEMP_FD
+    if _TEMP_FD is False:
+        return None
+    
     try:
-        with open('/sys/class/thermal/thermal_zone0/temp', 'r') as f:
-            temp = float(f.read()) / 1000.0
-            return temp
-    except:
+        with _TEMP_LOCK:
+            if _TEMP_FD is None:
+                _TEMP_FD = os.open(_CPU_TEMP_PATH, os.O_RDONLY)
+                atexit.register(os.close, _TEMP_FD)
+            # sysfs regenerates the value on every read from offset 0
+            return int(os.pread(_TEMP_FD, 16, 0)) / 1000.0
+    except FileNotFoundError:
+        _TEMP_FD = False
+        return None
+    except (OSError, ValueError):
         return None
 
 
@@ -125,6 +235,9 @@ def check_i2c_device(bus: int, address: int) -> bool:
     """
     Check if I2C device exists at address
     
+    Probes the one address directly over a cached SMBus handle when smbus2
+    is installed, otherwise falls back to scanning the bus with i2cdetect.
+    
     Args:
         bus: I2C bus number (usually 1)
         address: Device address (e.g., 0x33)
@@ -132,6 +245,27 @@ def check_i2c_device(bus: int, address: int) -> bool:
     Returns:
         True if device found
     """
+    if not SMBUS_AVAILABLE:
+        return _check_i2c_device_i2cdetect(bus, address)
+    
+    try:
+        with _I2C_LOCK:
+            smb = _I2C_BUSES.get(bus)
+            if smb is None:
+                smb = _I2C_BUSES[bus] = SMBus(bus)
+            # Same probe as i2cdetect's default mode: a read for ranges
+            # where a quick write can upset EEPROMs, quick write elsewhere
+            if 0x30 <= address <= 0x37 or 0x50 <= address <= 0x5F:
+                smb.read_byte(address)
+            else:
+                smb.write_quick(address)
+        return True
+    except OSError:
+        return False
+
+
+def _check_i2c_device_i2cdetect(bus: int, address: int) -> bool:
+    """Check for an I2C device by scanning the bus with i2cdetect"""
     import subprocess
     try:
         result = subprocess.run(
@@ -143,4 +277,13 @@ def check_i2c_device(bus: int, address: int) -> bool:
         hex_addr = f"{address:02x}"
         return hex_addr in result.stdout.lower()
     except:
-        return False
\ No newline at end of file
+        return False
+
+
+@atexit.register
+def _close_i2c_buses():
+    """Close cached I2C bus handles at interpreter exit"""
+    with _I2C_LOCK:
+        for smb in _I2C_BUSES.values():
+            smb.close()
+        _I2C_BUSES.clear()
@@ -3,11 +3,31 @@ Logging Utility
 Configures centralized logging
 """
 
+import copy
 import logging
-import logging.config
-import yaml
 from pathlib import Path
 
+# yaml and logging.config are imported inside the functions that use them;
+# together they cost ~30 ms, which short-lived tools importing utils skip
+
+# Parsed config per path, keyed on (mtime, size) so edits are picked up
+_CONFIG_CACHE = {}
+
+
+def _load_yaml_cached(path: Path) -> dict:
+    """Parse a YAML file, reusing the last parse while the file is unchanged"""
+    st = path.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _CONFIG_CACHE.get(path)
+    if cached is None or cached[0] != key:
+        import yaml
+        # libyaml-backed loader when available, much faster
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        # libyaml detects the encoding itself, so skip the text decoder
+        cached = _CONFIG_CACHE[path] = (key, yaml.load(path.read_bytes(), Loader=loader))
+    # dictConfig mutates the dict it is given
+    return copy.deepcopy(cached[1])
+
 
 def setup_logging():
     """Setup logging configuration"""
@@ -17,9 +37,9 @@ def setup_logging():
     Path('/home/smartie/transformer_monitor_data/logs').mkdir(parents=True, exist_ok=True)
     
     if config_path.exists():
-        with open(config_path) as f:
-            config = yaml.safe_load(f)
-            logging.config.dictConfig(config)
+        import logging.config
+        config = _load_yaml_cached(config_path)
+        logging.config.dictConfig(config)
     else:
         # Fallback to basic config
         logging.basicConfig(
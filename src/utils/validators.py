@@ -2,10 +2,25 @@
 Configuration Validators
 """
 
+import os
 import logging
-from pathlib import Path
 from typing import Dict, List, Any
 
+# Shared stand-in for missing optional sections (never mutated)
+_EMPTY = {}
+
+_VALID_I2C_ADDRS = frozenset({0x32, 0x33})
+_VALID_REFRESH_RATES = (0.5, 1, 2, 4, 8, 16, 32, 64)
+_VALID_REFRESH_RATE_SET = frozenset(_VALID_REFRESH_RATES)
+
+
+def _is_one_of(value, valid: frozenset) -> bool:
+    """Set membership that treats unhashable YAML values (lists, dicts) as invalid"""
+    try:
+        return value in valid
+    except TypeError:
+        return False
+
 
 class ConfigValidator:
     """Validates configuration settings"""
@@ -62,19 +77,23 @@ class ConfigValidator:
         
         # Check I2C address
         i2c_addr = camera.get('i2c_address')
-        if i2c_addr not in [0x32, 0x33]:
+        if i2c_addr is not None and not isinstance(i2c_addr, int):
+            self.errors.append(
+                f"Invalid i2c_address: {i2c_addr!r}. "
+                "Must be an integer such as 0x33"
+            )
+        elif not _is_one_of(i2c_addr, _VALID_I2C_ADDRS):
             self.warnings.append(
-                f"Unusual I2C address: {hex(i2c_addr)}. "
+                f"Unusual I2C address: {i2c_addr if i2c_addr is None else hex(i2c_addr)}. "
                 "MLX90640 typically uses 0x33"
             )
         
         # Check refresh rate
         refresh_rate = camera.get('refresh_rate', 8)
-        valid_rates = [0.5, 1, 2, 4, 8, 16, 32, 64]
-        if refresh_rate not in valid_rates:
+        if not _is_one_of(refresh_rate, _VALID_REFRESH_RATE_SET):
             self.errors.append(
                 f"Invalid refresh_rate: {refresh_rate}. "
-                f"Must be one of {valid_rates}"
+                f"Must be one of {list(_VALID_REFRESH_RATES)}"
             )
         
         # Check emissivity
@@ -130,15 +149,17 @@ class ConfigValidator:
             if not iot.get(field):
                 self.errors.append(f"aws.iot.{field} is required")
         
-        # Check certificates
+        # Check certificates (one stat each, no Path objects)
         certs = iot.get('certificates', {})
-        for cert_name in ['ca_cert', 'device_cert', 'private_key']:
+        for cert_name in ('ca_cert', 'device_cert', 'private_key'):
             cert_path = certs.get(cert_name)
-            if cert_path:
-                if not Path(cert_path).exists():
-                    self.errors.append(f"Certificate not found: {cert_path}")
-            else:
+            if not cert_path:
                 self.errors.append(f"aws.iot.certificates.{cert_name} not set")
+                continue
+            try:
+                os.stat(cert_path)
+            except (OSError, ValueError):
+                self.errors.append(f"Certificate not found: {cert_path}")
     
     def validate_roi_config(self, config: Dict):
         """Validate regions of interest"""
@@ -152,12 +173,16 @@ class ConfigValidator:
         max_x, max_y = frame_size
         
         for i, roi in enumerate(rois):
+            # Read each field once
+            name = roi.get('name')
+            coords = roi.get('coordinates')
+            thresholds = roi.get('thresholds') or _EMPTY
+            
             # Check name
-            if not roi.get('name'):
+            if not name:
                 self.errors.append(f"ROI {i}: name is required")
             
             # Check coordinates
-            coords = roi.get('coordinates')
             if not coords or len(coords) != 2:
                 self.errors.append(
                     f"ROI {roi.get('name', i)}: coordinates must be "
@@ -165,25 +190,23 @@ class ConfigValidator:
                 )
                 continue
             
-            x1, y1 = coords[0]
-            x2, y2 = coords[1]
+            (x1, y1), (x2, y2) = coords
             
             # Validate bounds
             if not (0 <= x1 < x2 <= max_x and 0 <= y1 < y2 <= max_y):
                 self.errors.append(
-                    f"ROI {roi.get('name')}: coordinates out of bounds. "
+                    f"ROI {name}: coordinates out of bounds. "
                     f"Frame size is {frame_size}"
                 )
             
             # Check thresholds
-            thresholds = roi.get('thresholds', {})
             warning = thresholds.get('warning', 0)
             critical = thresholds.get('critical', 0)
             emergency = thresholds.get('emergency', 0)
             
             if not (warning < critical < emergency):
                 self.warnings.append(
-                    f"ROI {roi.get('name')}: thresholds should be "
+                    f"ROI {name}: thresholds should be "
                     "warning < critical < emergency"
                 )
     
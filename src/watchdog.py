@@ -6,8 +6,24 @@ Ensures system reboots if application hangs
 import logging
 import subprocess
 import os
+import struct
+import time
 from threading import Thread, Event
 
+try:
+    import fcntl
+except ImportError:  # Non-Unix development hosts
+    fcntl = None
+
+WATCHDOG_DEVICE = '/dev/watchdog'
+
+# linux/watchdog.h: _IOR('W', 7, int)
+WDIOC_GETTIMEOUT = 0x80045707
+
+# Longest timeout the bcm2835 driver accepts; the configured timeout can't
+# be trusted beyond this when the driver's own value is unknown
+MAX_HW_TIMEOUT = 15
+
 
 class WatchdogTimer:
     """Hardware watchdog timer manager"""
@@ -19,26 +35,34 @@ class WatchdogTimer:
         self.thread = None
         self.stop_event = Event()
         self.enabled = False
+        self._wd_fd = None
+        # Minimum seconds between device writes; refined from the driver's
+        # timeout when the device is opened
+        self._pet_interval = min(timeout, MAX_HW_TIMEOUT) / 4
+        self._last_pet = float('-inf')
 
         self._enable_watchdog()
 
     def _enable_watchdog(self):
         """Enable hardware watchdog"""
         # Check if watchdog device is accessible
-        if not os.path.exists('/dev/watchdog'):
+        if not os.path.exists(WATCHDOG_DEVICE):
             self.logger.info("Watchdog device not found - running in development mode")
             self.enabled = False
             return
 
         # Check if we can access the watchdog device
-        if not os.access('/dev/watchdog', os.W_OK):
+        if not os.access(WATCHDOG_DEVICE, os.W_OK):
             self.logger.info("Watchdog device not writable - running without watchdog")
             self.enabled = False
             return
 
         try:
-            # Load watchdog kernel module (only if we have permissions)
-            subprocess.run(['modprobe', 'bcm2835_wdt'], check=False, capture_output=True)
+            # Load watchdog kernel module (only if we have permissions); it
+            # is usually built in or already loaded since /dev/watchdog
+            # exists, so skip the modprobe fork/exec in that case
+            if not os.path.isdir('/sys/module/bcm2835_wdt'):
+                subprocess.run(['modprobe', 'bcm2835_wdt'], check=False, capture_output=True)
             self.enabled = True
             self.logger.info("Watchdog module loaded and enabled")
         except Exception as e:
@@ -53,19 +77,64 @@ class WatchdogTimer:
     def stop(self):
         """Stop watchdog"""
         self.running = False
+        self._close_device()
         self.logger.info("Watchdog timer stopped")
     
+    def _open_device(self):
+        """
+        Open the watchdog device on the first pet
+        
+        The device arms on open and stays armed while the fd is held, so it
+        is opened by the monitoring loop rather than at startup, where the
+        long initialization and minute sync would outlast the timeout.
+        """
+        self._wd_fd = os.open(WATCHDOG_DEVICE, os.O_WRONLY)
+        if fcntl is None:
+            return
+
+        # Throttle pets against the timeout the driver is using (left as
+        # configured by the system); keep the fallback interval if the
+        # driver can't report it
+        try:
+            result = fcntl.ioctl(self._wd_fd, WDIOC_GETTIMEOUT, struct.pack('i', 0))
+        except OSError as e:
+            self.logger.debug(f"Watchdog timeout unavailable, using fallback pet interval: {e}")
+            return
+        hw_timeout = struct.unpack('i', result)[0]
+        if hw_timeout > 0:
+            self._pet_interval = hw_timeout / 4
+    
+    def _close_device(self):
+        """
+        Release the device
+        
+        No magic close character is written, so the watchdog stays armed
+        after stop() just as it did when each pet closed the device.
+        """
+        if self._wd_fd is None:
+            return
+        os.close(self._wd_fd)
+        self._wd_fd = None
+    
     def pet(self):
         """Pet the watchdog (reset timer)"""
         if not self.enabled:
             return
 
+        # Callers may pet every loop iteration; one write per quarter of the
+        # hardware timeout is plenty
+        now = time.monotonic()
+        if now - self._last_pet < self._pet_interval:
+            return
+
         try:
-            # Write to watchdog device
-            with open('/dev/watchdog', 'w') as wd:
-                wd.write('1')
+            if self._wd_fd is None:
+                self._open_device()
+            # Any write to the open device is a keepalive
+            os.write(self._wd_fd, b'1')
+            self._last_pet = now
         except PermissionError:
-            # Non-root user cannot pet watchdog, ignore or log once
-            pass
+            # Non-root user cannot pet watchdog; stop trying
+            self.enabled = False
         except Exception as e:
-            self.logger.error(f"Failed to pet watchdog: {e}")
\ No newline at end of file
+            self.logger.error(f"Failed to pet watchdog: {e}")
@@ -34,8 +34,8 @@ def test_basic_logging():
 
     # Create event logger with test database
     test_db = "/tmp/test_camera_events.db"
-    if Path(test_db).exists():
-        Path(test_db).unlink()
+    for suffix in ('', '-wal', '-shm'):
+        Path(test_db + suffix).unlink(missing_ok=True)
 
     event_logger = EventLogger(db_path=test_db)
 
@@ -119,17 +119,11 @@ def test_query_by_date_range(event_logger):
     yesterday = datetime.now() - timedelta(days=1)
     last_week = datetime.now() - timedelta(days=7)
 
-    event_logger.log_event(
-        event_type='maintenance_visit',
-        confidence=0.80,
-        timestamp=yesterday
-    )
-
-    event_logger.log_event(
-        event_type='animal',
-        confidence=0.75,
-        timestamp=last_week
-    )
+    count = event_logger.bulk_log_events([
+        {'event_type': 'maintenance_visit', 'confidence': 0.80, 'timestamp': yesterday},
+        {'event_type': 'animal', 'confidence': 0.75, 'timestamp': last_week},
+    ])
+    assert count == 2, "Both events should be logged"
 
     # Query last 24 hours
     logger.info("\nQuerying events from last 24 hours...")
@@ -163,17 +157,19 @@ def test_maintenance_visits(event_logger):
 
     # Add some maintenance visits
     logger.info("\nAdding maintenance visits over the past month...")
-    for i in range(5):
-        days_ago = i * 7  # One per week
-        timestamp = datetime.now() - timedelta(days=days_ago)
-        event_logger.log_event(
-            event_type='maintenance_visit',
-            confidence=0.85,
-            image_path=f'/data/images/maintenance_{i}.jpg',
-            duration_seconds=30 + i * 10,
-            notes=f'Week {i+1} maintenance check',
-            timestamp=timestamp
-        )
+    now = datetime.now()
+    count = event_logger.bulk_log_events([
+        {
+            'event_type': 'maintenance_visit',
+            'confidence': 0.85,
+            'image_path': f'/data/images/maintenance_{i}.jpg',
+            'duration_seconds': 30 + i * 10,
+            'notes': f'Week {i+1} maintenance check',
+            'timestamp': now - timedelta(days=i * 7)  # One per week
+        }
+        for i in range(5)
+    ])
+    assert count == 5, "All maintenance visits should be logged"
 
     # Get maintenance visits
     logger.info("\nRetrieving maintenance visits from last 30 days...")
@@ -14,6 +14,9 @@ from data_processor import DataProcessor
 
 
 class TestDataProcessor(unittest.TestCase):
+
+    # Deterministic 24x32 frame, built once for the whole class
+    TEST_FRAME = np.random.default_rng(0).uniform(50, 80, (24, 32)).astype(np.float32)
     
     def setUp(self):
         """Set up test fixtures"""
@@ -40,10 +43,7 @@ class TestDataProcessor(unittest.TestCase):
     
     def test_process_frame(self):
         """Test frame processing"""
-        # Create test frame
-        frame = np.random.uniform(50, 80, (24, 32))
-        
-        result = self.processor.process(frame)
+        result = self.processor.process(self.TEST_FRAME)
         
         # Assertions
         self.assertIn('timestamp', result)
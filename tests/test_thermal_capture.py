@@ -17,6 +17,7 @@ sys.modules['busio'] = MagicMock()
 sys.modules['adafruit_mlx90640'] = MagicMock()
 
 from thermal_capture import ThermalCapture
+import thermal_kernels
 
 
 class TestThermalCapture(unittest.TestCase):
@@ -53,6 +54,36 @@ class TestThermalCapture(unittest.TestCase):
         self.assertTrue(np.all(frame >= 20))
         self.assertTrue(np.all(frame <= 80))
     
+    def test_background_capture(self):
+        """Test frames read on the background thread reach get_frame"""
+        mock_frame = list(np.random.uniform(20, 80, 768))
+
+        def mock_getFrame(frame):
+            frame[:] = mock_frame
+
+        self.mock_mlx.getFrame = mock_getFrame
+
+        self.capture.start_background_capture()
+        try:
+            frame = self.capture.get_frame(apply_processing=False)
+            # Nothing newer yet: the cached frame comes back without blocking
+            cached = self.capture.get_frame(apply_processing=False)
+            frames_after_cached = self.capture.frame_count
+            # Results are cached per mode, so alternating callers each get
+            # their own kind of frame
+            processed = self.capture.get_frame()
+            raw_again = self.capture.get_frame(apply_processing=False)
+        finally:
+            self.capture.stop_background_capture()
+
+        self.assertIsNone(self.capture._capture_thread)
+        np.testing.assert_allclose(frame.ravel(), np.float32(mock_frame))
+        self.assertIs(cached, frame)
+        self.assertEqual(frames_after_cached, 1)
+        self.assertEqual(processed.shape, (24, 32))
+        self.assertFalse(np.allclose(processed.ravel(), np.float32(mock_frame)))
+        np.testing.assert_allclose(raw_again.ravel(), np.float32(mock_frame))
+
     def test_get_frame_invalid(self):
         """Test handling of invalid frame data"""
         # Mock invalid frame (out of range)
@@ -78,11 +109,308 @@ class TestThermalCapture(unittest.TestCase):
         
         # Corrected temperature should be higher
         self.assertTrue(np.all(corrected > test_frame))
+        np.testing.assert_allclose(corrected, (50.0 + 273.15) / 0.95 ** 0.25 - 273.15)
         
         # Test with emissivity 1.0 (no correction)
         no_correction = self.capture.apply_emissivity_correction(test_frame, 1.0)
         np.testing.assert_array_almost_equal(no_correction, test_frame)
     
+    def test_temporal_filter(self):
+        """Test temporal filter weights recent frames more heavily"""
+        frames = [np.full((24, 32), t, dtype=np.float32) for t in (20.0, 30.0, 40.0)]
+        for f in frames:
+            self.capture._push_frame(f)
+
+        filtered = self.capture._temporal_filter(frames[-1])
+
+        weights = np.exp(np.linspace(-1, 0, 3))
+        expected = np.average(np.array(frames), axis=0, weights=weights)
+        self.assertEqual(filtered.shape, (24, 32))
+        np.testing.assert_allclose(filtered, expected, rtol=1e-5)
+
+        # Ring wraps around: only the most recent buffer_size frames count
+        frames = [np.full((24, 32), t, dtype=np.float32) for t in range(10, 80, 10)]
+        for f in frames:
+            self.capture._push_frame(f)
+
+        filtered = self.capture._temporal_filter(frames[-1])
+
+        recent = np.array(frames[-self.capture.temporal_buffer_size:])
+        weights = np.exp(np.linspace(-1, 0, len(recent)))
+        expected = np.average(recent, axis=0, weights=weights)
+        np.testing.assert_allclose(filtered, expected, rtol=1e-5)
+
+    def test_temporal_filter_bypassed_on_scene_change(self):
+        """Test a large frame-to-frame change skips temporal averaging"""
+        for _ in range(3):
+            self.capture._push_frame(np.full((24, 32), 30.0, dtype=np.float32))
+
+        for fused in sorted({False, thermal_kernels.NUMBA_AVAILABLE}):
+            self.capture.use_fused_kernel = fused
+            self.capture._process_frame(np.full((24, 32), 30.0, dtype=np.float32))
+            steady = self.capture._process_frame(np.full((24, 32), 31.0, dtype=np.float32))
+            jump = self.capture._process_frame(np.full((24, 32), 50.0, dtype=np.float32))
+
+            np.testing.assert_allclose(steady, 30.0, rtol=1e-5)
+            np.testing.assert_allclose(jump, 50.0, rtol=1e-5)
+
+    def test_scene_change_ignores_ambient_offset(self):
+        """Test ambient compensation of past frames doesn't trip the bypass"""
+        self.capture.ambient_temp = 85.0  # 6 C offset, above the 5 C threshold
+        offset = self.capture._ambient_offset()
+
+        for fused in sorted({False, thermal_kernels.NUMBA_AVAILABLE}):
+            self.capture.use_fused_kernel = fused
+            self.capture._ring_len = 0
+            raw = np.full((24, 32), 30.0, dtype=np.float32)
+            for _ in range(3):
+                self.capture._push_frame(self.capture._process_frame(raw))
+
+            steady = self.capture._process_frame(np.full((24, 32), 30.5, dtype=np.float32))
+
+            # Temporal average of the compensated ring, compensated once more
+            np.testing.assert_allclose(steady, 30.0 - 2 * offset, rtol=1e-5)
+
+    def test_frame_statistics(self):
+        """Test frame statistics match NumPy reference values"""
+        frame = np.random.uniform(20, 80, (24, 32)).astype(np.float32)
+
+        stats = self.capture.get_frame_statistics(frame)
+
+        self.assertAlmostEqual(stats['min'], float(frame.min()), places=4)
+        self.assertAlmostEqual(stats['max'], float(frame.max()), places=4)
+        self.assertAlmostEqual(stats['mean'], float(frame.mean()), places=4)
+        self.assertAlmostEqual(stats['median'], float(np.median(frame)), places=4)
+        self.assertAlmostEqual(stats['std'], float(frame.std()), places=4)
+        self.assertAlmostEqual(stats['percentile_95'], float(np.percentile(frame, 95)), places=4)
+        self.assertAlmostEqual(stats['percentile_5'], float(np.percentile(frame, 5)), places=4)
+        self.assertAlmostEqual(stats['range'], float(np.ptp(frame)), places=4)
+
+        # Repeat queries for the same frame are served from the cache
+        self.assertEqual(self.capture.get_frame_statistics(frame), stats)
+        other = frame + 1.0
+        self.assertAlmostEqual(self.capture.get_frame_statistics(other)['min'], stats['min'] + 1.0, places=4)
+
+    def test_detect_hotspots(self):
+        """Test hotspot detection finds separate blobs with correct properties"""
+        frame = np.full((24, 32), 30.0, dtype=np.float32)
+        frame[2:4, 2:5] = 90.0      # 2x3 blob
+        frame[3, 3] = 100.0
+        frame[15:20, 20:25] = 85.0  # 5x5 blob
+
+        hotspots = self.capture.detect_hotspots(frame, threshold=80.0)
+
+        self.assertEqual(len(hotspots), 2)
+        by_area = sorted(hotspots, key=lambda h: h['area'])
+        self.assertEqual(by_area[0]['area'], 6)
+        self.assertEqual(by_area[0]['center'], (3, 2))
+        self.assertAlmostEqual(by_area[0]['max_temp'], 100.0)
+        self.assertAlmostEqual(by_area[0]['avg_temp'], (5 * 90.0 + 100.0) / 6)
+        self.assertEqual(by_area[1]['area'], 25)
+        self.assertEqual(by_area[1]['center'], (22, 17))
+        self.assertAlmostEqual(by_area[1]['max_temp'], 85.0)
+
+        # No pixels above threshold
+        self.assertEqual(self.capture.detect_hotspots(frame, threshold=150.0), [])
+
+    def test_hotspot_history(self):
+        """Test hotspot history keeps the last passes as records and dicts"""
+        frame = np.full((24, 32), 30.0, dtype=np.float32)
+        frame[2:4, 2:5] = 90.0
+        frame[15:20, 20:25] = 85.0
+
+        for _ in range(12):
+            self.capture.detect_hotspots(frame, threshold=80.0)
+        self.capture.detect_hotspots(frame, threshold=150.0)
+
+        records = self.capture.get_hotspot_records()
+        self.assertEqual(len(records), 2 * 9)
+        self.assertEqual(sorted(set(records['area'].tolist())), [6, 25])
+
+        history = self.capture.hotspots_history
+        self.assertEqual(len(history), 10)
+        self.assertEqual(history[-1]['hotspots'], [])
+        by_area = sorted(history[0]['hotspots'], key=lambda h: h['area'])
+        self.assertEqual(by_area[0]['center'], (3, 2))
+        self.assertAlmostEqual(by_area[1]['max_temp'], 85.0)
+        self.assertEqual(self.capture.get_processing_stats()['hotspots_tracked'], 10)
+
+    @patch('thermal_capture.busio.I2C')
+    @patch('thermal_capture.adafruit_mlx90640.MLX90640')
+    def test_hotspot_history_file(self, mock_mlx, mock_i2c):
+        """Test hotspot history is mapped to a file and survives a restart"""
+        import tempfile
+        from thermal_capture import _HOTSPOT_DTYPE, _HOTSPOT_STATE_DTYPE
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'history', 'hotspots.ring')
+            capture = ThermalCapture(hotspot_history_path=path)
+            frame = np.full((24, 32), 30.0, dtype=np.float32)
+            frame[2:4, 2:5] = 90.0
+            capture.detect_hotspots(frame, threshold=80.0)
+            capture.close()
+
+            header = np.fromfile(path, dtype=_HOTSPOT_STATE_DTYPE, count=1)
+            self.assertEqual(header['rows'][0], 1)
+            self.assertEqual(header['passes'][0], 1)
+            saved = np.fromfile(path, dtype=_HOTSPOT_DTYPE, offset=_HOTSPOT_STATE_DTYPE.itemsize)
+            self.assertEqual(len(saved), 1024)
+            self.assertEqual(saved[0]['area'], 6)
+            self.assertAlmostEqual(saved[0]['max_t'], 90.0)
+            self.assertEqual(saved[1]['ts'], 0)
+            self.assertEqual(len(capture.get_hotspot_records()), 1)
+            del capture
+
+            # Reopening resumes the ring instead of truncating it
+            capture = ThermalCapture(hotspot_history_path=path)
+            self.assertEqual(len(capture.get_hotspot_records()), 1)
+            capture.detect_hotspots(frame, threshold=80.0)
+            self.assertEqual(len(capture.get_hotspot_records()), 2)
+            self.assertEqual(len(capture.hotspots_history), 2)
+            capture.close()
+            del capture
+
+    @unittest.skipUnless(thermal_kernels.NUMBA_AVAILABLE, "numba not installed")
+    def test_hotspot_labeling_matches_opencv(self):
+        """Test compiled blob labeling gives the same blobs as OpenCV"""
+        rng = np.random.default_rng(2)
+        frame = rng.uniform(20, 100, (24, 32)).astype(np.float32)
+
+        self.capture.use_fused_kernel = True
+        fused = self.capture.detect_hotspots(frame, threshold=70.0)
+        self.capture.use_fused_kernel = False
+        expected = self.capture.detect_hotspots(frame, threshold=70.0)
+
+        key = lambda h: (h['area'], h['center'], h['max_temp'])
+        fused, expected = sorted(fused, key=key), sorted(expected, key=key)
+        self.assertEqual([key(h) for h in fused], [key(h) for h in expected])
+        for f, e in zip(fused, expected):
+            self.assertAlmostEqual(f['avg_temp'], e['avg_temp'], places=4)
+
+    def test_bad_pixel_correction(self):
+        """Test isolated outlier pixels are replaced by their neighborhood"""
+        frame = np.full((24, 32), 30.0, dtype=np.float32)
+        frame[10, 12] = 140.0
+
+        corrected = self.capture._correct_bad_pixels(frame)
+
+        self.assertAlmostEqual(float(corrected[10, 12]), 30.0)
+        self.assertIn((10, 12), self.capture.bad_pixels)
+
+    def test_bad_pixel_calibration(self):
+        """Test startup calibration masks noisy and stuck pixels"""
+        rng = np.random.default_rng(1)
+        stack = rng.normal(30.0, 0.1, (20, 24, 32)).astype(np.float32)
+        stack[:, 5, 6] += rng.choice([-8.0, 8.0], 20)  # flickering
+        stack[:, 20, 30] = 140.0  # stuck hot
+
+        self.capture._calibrate_bad_pixels(stack)
+
+        self.assertEqual(self.capture.bad_pixels, {(5, 6), (20, 30)})
+
+        frame = np.full((24, 32), 30.0, dtype=np.float32)
+        frame[5, 6] = 50.0
+        frame[20, 30] = 140.0
+        corrected = self.capture._correct_bad_pixels(frame)
+
+        self.assertAlmostEqual(float(corrected[5, 6]), 30.0, places=4)
+        self.assertAlmostEqual(float(corrected[20, 30]), 30.0, places=4)
+        self.assertEqual(float(frame[5, 6]), 50.0)
+
+    def test_bad_pixel_calibration_keeps_scene_changes(self):
+        """Test pixels warming up or forming a hot area are not masked"""
+        rng = np.random.default_rng(1)
+        stack = rng.normal(30.0, 0.1, (20, 24, 32)).astype(np.float32)
+        stack[10:, 8:10, 8:10] += 8.0  # 2x2 spot heats mid-calibration
+        stack[:, 15, 3] += np.linspace(0.0, 8.0, 20)  # single pixel drifting
+        stack[:, 2:4, 20:22] = 140.0  # hot object already in view
+
+        self.capture._calibrate_bad_pixels(stack)
+
+        self.assertEqual(self.capture.bad_pixels, set())
+
+        # Too many isolated bad pixels: keep per-frame detection instead
+        stack = rng.normal(30.0, 0.1, (20, 24, 32)).astype(np.float32)
+        for i in range(10):
+            stack[:, 2 * i + 2, 3 * i + 1] = 140.0
+        self.capture.bad_pixels = set()
+        self.capture._bad_mask = None
+        self.capture._calibrate_bad_pixels(stack)
+
+        self.assertIsNone(self.capture._bad_mask)
+
+    def test_thermal_gradient(self):
+        """Test gradient magnitude and direction on a horizontal ramp"""
+        frame = np.tile(np.arange(32, dtype=np.float32), (24, 1))
+
+        magnitude, direction = self.capture.calculate_thermal_gradient(frame)
+
+        self.assertEqual(magnitude.shape, (24, 32))
+        # Sobel of a unit ramp is 8 away from the borders, pointing along +x
+        np.testing.assert_allclose(magnitude[1:-1, 1:-1], 8.0, rtol=1e-5)
+        interior = direction[1:-1, 1:-1]
+        self.assertTrue(np.all((interior < 0.5) | (interior > 359.5)))
+
+    @unittest.skipUnless(thermal_kernels.NUMBA_AVAILABLE, "numba not installed")
+    def test_fused_pipeline_matches_numpy(self):
+        """Test the compiled pipeline gives the NumPy/OpenCV result"""
+        rng = np.random.default_rng(0)
+        self.capture.ambient_temp = 35.0
+
+        for count in range(5):
+            frame = rng.uniform(20, 60, (24, 32)).astype(np.float32)
+            frame[3, 4] = 145.0
+
+            # Both paths must see the same previous frame for the scene check
+            previous = self.capture._prev_corrected.copy()
+            self.capture.use_fused_kernel = False
+            expected = self.capture._process_frame(frame)
+            np.copyto(self.capture._prev_corrected, previous)
+            self.capture._has_prev_corrected = count > 0
+            self.capture.use_fused_kernel = True
+            fused = self.capture._process_frame(frame)
+
+            np.testing.assert_allclose(fused, expected, atol=1e-3)
+            self.capture._push_frame(frame)
+
+        self.assertIn((3, 4), self.capture.bad_pixels)
+
+        # Calibrated mask path
+        self.capture._calibrate_bad_pixels(np.stack([frame] * 20))
+        self.capture._ring_len = 0
+        self.capture.use_fused_kernel = False
+        expected = self.capture._process_frame(frame)
+        self.capture.use_fused_kernel = True
+        fused = self.capture._process_frame(frame)
+        np.testing.assert_allclose(fused, expected, atol=1e-3)
+
+    @unittest.skipUnless(thermal_kernels.NUMBA_AVAILABLE, "numba not installed")
+    def test_gradient_kernel_matches_opencv(self):
+        """Test compiled Sobel stencil matches cv2.Sobel including borders"""
+        frame = np.random.default_rng(3).uniform(20, 80, (24, 32)).astype(np.float32)
+
+        self.capture.use_fused_kernel = True
+        magnitude, direction = self.capture.calculate_thermal_gradient(frame)
+        self.capture.use_fused_kernel = False
+        expected_mag, expected_dir = self.capture.calculate_thermal_gradient(frame)
+
+        np.testing.assert_allclose(magnitude, expected_mag, atol=1e-3)
+        np.testing.assert_allclose(direction, expected_dir, atol=1e-2)
+
+    def test_edge_preserving_upscale(self):
+        """Test guided upscale keeps a step edge sharper than bicubic"""
+        frame = np.full((24, 32), 30.0, dtype=np.float32)
+        frame[:, 16:] = 80.0
+
+        bicubic = self.capture.super_resolution_upscale(frame)
+        guided = self.capture.super_resolution_upscale(frame, edge_preserving=True)
+
+        self.assertEqual(guided.shape, (96, 128))
+        self.assertGreater(np.abs(np.diff(guided, axis=1)).max(),
+                           np.abs(np.diff(bicubic, axis=1)).max())
+        # Less overshoot around the edge than bicubic ringing
+        self.assertLess(guided.max() - 80.0, bicubic.max() - 80.0)
+
     def test_frame_validation(self):
         """Test frame validation logic"""
         # Valid frame